@@ -3,13 +3,12 @@ The 'check' subcommand
 """
 import typing as t
 import logging
-import tomllib
 import time
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import ExitStack
+from functools import lru_cache
 
 import click
-import yaml
 from rich.live import Live
 from rich.console import Group
 from rich.rule import Rule
@@ -52,6 +51,48 @@ config.cli.yaml_exts = Setting((".yml", ".yaml"))
 #: Names for the config section in checks files
 config.cli.config_sections = Setting(("config", "Config"))
 
+#: Run checks concurrently. Disable to run checks one at a time, which is
+#: useful for debugging
+config.cli.parallel = Setting(True)
+
+
+@lru_cache(maxsize=1)
+def _yaml_loader() -> type:
+    """The safe YAML loader class, using the libyaml-based loader if it's
+    available"""
+    try:
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeLoader as Loader
+    return Loader
+
+
+def _load_toml(filepath: str) -> dict:
+    """Load a TOML checks file"""
+    import tomllib
+
+    with open(filepath, "rb") as f:
+        return tomllib.load(f)
+
+
+def _load_yaml(filepath: str) -> dict:
+    """Load a YAML checks file"""
+    import yaml
+
+    with open(filepath, "r") as f:
+        return yaml.load(f, Loader=_yaml_loader())
+
+
+@lru_cache(maxsize=16)
+def _load_checks_file(filepath: str, mtime_ns: int, loader: t.Callable) -> dict:
+    """Load a checks file with the given loader.
+
+    The file's modification time is part of the cache key so that unchanged
+    files are not parsed again. The returned dict is shared between calls and
+    should not be modified.
+    """
+    return loader(filepath)
+
 
 def validate_checks_files(
     ctx: click.Context, param: click.Parameter, values: t.Tuple[str]
@@ -68,7 +109,7 @@ def validate_checks_files(
         raise click.MissingParameter(
             "Could not find a checks file.", ctx=ctx, param=param
         )
-    logging.debug(f"Checking the following files: {existing_files}")
+    logger.debug("Checking the following files: %s", existing_files)
     return existing_files
 
 
@@ -78,33 +119,32 @@ def validate_checks_files(
 @click.argument("checks_files", nargs=-1, type=str, callback=validate_checks_files)
 def check_cmd(checks_files, env):
     """Run checks"""
-    logger.debug(f"check_files={checks_files}, env={env}")
+    logger.debug("check_files=%s, env=%s", checks_files, env)
+
+    # Loaders to parse checks files by filetype (extension)
+    loaders = {ext: _load_toml for ext in config.cli.toml_exts}
+    loaders.update({ext: _load_yaml for ext in config.cli.yaml_exts})
 
     # Convert the checks_files into checks
     checks = []
     for checks_file in checks_files:
         # Parse the file by filetype
-        if checks_file.suffix in config.cli.toml_exts:
-            with open(checks_file, "rb") as f:
-                d = tomllib.load(f)
-
-        elif checks_file.suffix in config.cli.yaml_exts:
-            with open(checks_file, "r") as f:
-                d = yaml.load(f, Loader=yaml.SafeLoader)
-
-        else:
+        loader = loaders.get(checks_file.suffix)
+        if loader is None:
             continue
+        d = _load_checks_file(str(checks_file), checks_file.stat().st_mtime_ns, loader)
 
         # pyproject.toml files have their items placed under the [tool.geomancy]
         # section
         if checks_file.name == "pyproject.toml":
             d = d.get("tool", dict()).get("geomancy", dict())
 
-        # Load config section, if available
+        # Load config section, if available, and remove it from the checks
         for config_name in config.cli.config_sections:
-            config_section = d.pop(config_name, None)
+            config_section = d.get(config_name, None)
             if isinstance(config_section, dict):
                 config.update(config_section)
+        d = {k: v for k, v in d.items() if k not in config.cli.config_sections}
 
         # Load the rest into a root CheckBase
         check = Check.load(d, name=str(checks_file))
@@ -127,8 +167,10 @@ def check_cmd(checks_files, env):
     console = Console(theme=Theme({"repr.number": ""}))
 
     with ExitStack() as stack:
-        # Context manager for running checks in multiple threads
-        executor = stack.enter_context(ThreadPoolExecutor())
+        # Context manager for running checks in multiple threads, or in a
+        # single thread if parallel checks are disabled
+        max_workers = None if config.cli.parallel else 1
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers))
 
         # Context manager for rendering live to the terminal (rich)
         live = stack.enter_context(Live(refresh_per_second=4, console=console))
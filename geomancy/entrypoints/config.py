@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 @click.option("--yaml", is_flag=True, help="Print default config in yaml format")
 def config_cmd(toml, yaml, **kwargs):
     """Configuration information"""
-    logger.debug(f"toml={toml}, yaml={yaml}")
+    logger.debug("toml=%s, yaml=%s", toml, yaml)
 
     if toml:
         print(config.dumps_toml())
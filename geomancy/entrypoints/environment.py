@@ -66,7 +66,7 @@ class EnvOption(click.Option):
         # Get options
         if "overwrite" in opts:
             self.overwrite = opts["overwrite"]
-            logger.debug(f"Environment overwrite set to: {self.overwrite}")
+            logger.debug("Environment overwrite set to: %s", self.overwrite)
 
         # Return as normal
         return super().handle_parse_result(ctx, opts, args)
@@ -85,7 +85,14 @@ class EnvOption(click.Option):
         # Retrieve the env_files from the arguments
         existing_paths = []
         for path in value:
-            existing_paths += filepaths(path)
+            paths = filepaths(path)
+            if len(paths) == 0:
+                raise click.BadParameter(
+                    f"Could not find the environment file '{path}'.",
+                    ctx=ctx,
+                    param=self,
+                )
+            existing_paths += paths
 
         # Load the environment files and keep track of the number of variables
         # substituted
@@ -112,7 +119,7 @@ def env_options(func=None):
             "--env",
             "-e",
             multiple=True,
-            type=click.Path(exists=True),
+            type=str,
             cls=EnvOption,
             help="Environment files to load",
         ),
@@ -18,7 +18,7 @@ logger = logging.getLogger(__name__)
 @click.argument("args", nargs=-1)
 def run_cmd(args, env):
     """Run command within environment"""
-    logger.debug(f"args={args}, env={env}")
+    logger.debug("args=%s, env=%s", args, env)
 
     # Run the command
     result = subprocess.run(args, env=env)
@@ -1,5 +1,6 @@
 """CLI utils"""
 import typing as t
+import os
 from pathlib import Path
 import logging
 
@@ -22,17 +23,9 @@ def filepaths(string: str) -> t.List[Path]:
     paths
         The paths for the existing files
     """
-    # See if there's a glob pattern in the string
-    if any(c in string for c in ("*", "?", "[", "]")):
-        # Expand the glob from the current directory
-        paths = list(Path(".").glob(string))
-    else:
-        paths = [Path(string)]
+    # Check plain paths directly, without creating a Path for missing files
+    if not any(c in string for c in ("*", "?", "[", "]")):
+        return [Path(string)] if os.path.isfile(string) else []
 
-    # Check the paths
-    existing_paths = []
-    for path in paths:
-        if path.is_file():
-            existing_paths.append(path)
-
-    return existing_paths
+    # Expand the glob from the current directory and check the paths
+    return [path for path in Path(".").glob(string) if path.is_file()]
@@ -5,6 +5,8 @@ import re
 import codecs
 import logging
 from pathlib import Path
+from dataclasses import dataclass
+from functools import lru_cache
 
 __all__ = ("sub_env", "parse_env", "load_env")
 
@@ -14,8 +16,7 @@ logger = logging.getLogger(__name__)
 sub_re = re.compile(
     r"[$]"  # Start with a '$'. e.g. $NAME
     r"((?P<name_nobrace>[a-zA-Z_][a-zA-Z0-9_:\-?+]*)|"  # e.g. $NAME
-    r" \{(?P<name_brace>[a-zA-Z_][a-zA-Z0-9_\s:\-?+]*)\})",  # e.g ${NAME}
-    re.VERBOSE,
+    r"\{(?P<name_brace>[a-zA-Z_][a-zA-Z0-9_\s:\-?+]*)\})"  # e.g ${NAME}
 )
 
 #: Regex to identify alternate variables from variable names
@@ -24,8 +25,7 @@ sub_alt_re = re.compile(
     # Does not require a brace. e.g. $NAME
     r"(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)"
     # May have an alternative descriptor
-    r"((?P<default>:-|-)|(?P<error>:\?|\?)|(?P<replace>:\+|\+))?(?P<alt>[\w\s]*)",
-    re.VERBOSE,
+    r"((?P<default>:-|-)|(?P<error>:\?|\?)|(?P<replace>:\+|\+))?(?P<alt>[\w\s]*)"
 )
 
 #: Regex to match environment variable names
@@ -33,35 +33,85 @@ env_name = r"(?P<name>[a-zA-Z_][a-zA-Z0-9_]*)"  # env variable name
 env_name_re = re.compile(env_name)
 
 #: Regex to match environment variable values with substitution
-env_value = (
+env_value_re = re.compile(
     # Quoted value--e.g. "My $VAR" or 'My $VAR'--allowing for escaped quotes
     r"""((?P<quote>["|']{1,3})(?P<qvalue>(?:\\.|[^"'\\])+)(?P=quote)[^'"\n]*|"""
     # Unquoted value--e.g. My $VAR
     r"""(?P<value>[^'"\n]+))"""
 )
-env_value_re = re.compile(
-    env_value,
-    re.MULTILINE | re.DOTALL,
-)
-
-#: Regex to match "name=value" pairs from an env file
-env_name_value_re = re.compile(
-    r"^\s*{env_name}\s*=\s*{env_value}\s*$".format(
-        env_name=env_name, env_value=env_value
-    ),
-    re.MULTILINE | re.DOTALL,
-)
-
-#: Regex to strip comments to the end of a line--# and not escaped values, \#
-comment_re = re.compile(r"(^|\s+)(#.+)$")
 
 #: Regex to strip backslashes from escaped quotes.
 #: e.g. r"Let\'s go" -> r"Let's go"
 escaped_quote_re = re.compile(r"\\(['\"])")
 
+#: Decoder for escape characters in double-quoted values. e.g. \\t -> \t
+_unicode_escape = codecs.getdecoder("unicode_escape")
+
+
+@lru_cache(maxsize=1024)
+def _is_valid_name(name: str) -> bool:
+    """Whether the string is a valid environment variable name. Results are
+    cached since the same names are often parsed repeatedly."""
+    return env_name_re.fullmatch(name) is not None
+
+
+@dataclass(slots=True)
+class _EnvSubber:
+    """Substitute sub_re matches from the environment variables, if possible,
+    or return unmodified"""
+
+    #: In addition to os.environ, search these variables for matches
+    env_vars: t.Optional[t.Mapping[str, str]] = None
+
+    #: Missing environment variables will have this value placed instead
+    missing_default: str = ""
+
+    def __call__(self, m: re.Match) -> str:
+        # Get the variable name, which may include alternates identified by
+        # :-/-/:?/?/:+/"
+        name = m["name_brace"] if m["name_brace"] is not None else m["name_nobrace"]
+
+        # Look up names without alternates directly--the common case
+        if _is_valid_name(name):
+            if name in os.environ:
+                return os.environ[name]
+            elif self.env_vars and name in self.env_vars:
+                return self.env_vars[name]
+            else:
+                return self.missing_default
+
+        # Parse the alternate values
+        alt_m = sub_alt_re.match(name)
+        name = alt_m["name"] if alt_m and alt_m["name"] else name
+        default = alt_m["alt"] if alt_m and alt_m["default"] else None
+        error = alt_m["alt"] if alt_m and alt_m["error"] else None
+        replace = alt_m["alt"] if alt_m and alt_m["replace"] else None
+
+        if name in os.environ:
+            # found match in environment variables ('replace' will
+            # replace the returned value)
+            return os.environ[name] if replace is None else replace
+
+        elif self.env_vars and name in self.env_vars and not replace:
+            # found match in passed variables (replace will replace its value)
+            return self.env_vars[name] if replace is None else replace
+
+        elif default is not None:  # Not found, return default if available
+            return default
+
+        elif error is not None:  # Not found, raise exception
+            raise EnvironmentError(error)
+
+        else:
+            return self.missing_default
+
 
 def sub_env(
-    string: str, missing_default: str = "", strip_values: bool = True, **kwargs
+    string: str,
+    missing_default: str = "",
+    strip_values: bool = True,
+    *,
+    env_vars: t.Optional[t.Mapping[str, str]] = None,
 ) -> str:
     """Try to substitute environment variables in the string.
 
@@ -73,8 +123,8 @@ def sub_env(
         Missing environment variables will have this value placed instead
     strip_values
         Remove whitespace at the start and end of non-quoted values
-    kwargs
-        In addition to os.environ, search the given kwargs for matches.
+    env_vars
+        In addition to os.environ, search the given variables for matches.
 
     Raises
     ------
@@ -101,83 +151,95 @@ def sub_env(
     .. _compose: https://docs.docker.com/compose/environment-variables/env-file/
     """
 
-    # Substitute environment variables in values
-    def sub_func(m: re.Match):
-        """Substitute a regex match from the environment variables, if possible,
-        or return unmodified"""
-        # Get the variable name, which may include alternates identified by
-        # :-/-/:?/?/:+/"
-        d = m.groupdict()
-        name = d["name_brace"] if d["name_brace"] is not None else d["name_nobrace"]
-
-        # Parse the alternate values
-        alt_m = sub_alt_re.match(name)
-        alt_d = alt_m.groupdict() if alt_m is not None else None
-
-        name = alt_d["name"] if alt_d and alt_d["name"] else name
-        default = alt_d["alt"] if alt_d and alt_d["default"] else None
-        error = alt_d["alt"] if alt_d and alt_d["error"] else None
-        replace = alt_d["alt"] if alt_d and alt_d["replace"] else None
-
-        if name in os.environ:
-            # found match in environment variables ('replace' will
-            # replace the returned value)
-            return os.environ[name] if replace is None else replace
-
-        elif name in kwargs and not replace:
-            # found match in passed keyword arguments (replace will replace its value)
-            return kwargs[name] if replace is None else replace
-
-        elif default is not None:  # Not found, return default if available
-            return default
-
-        elif error is not None:  # Not found, raise exception
-            raise EnvironmentError(error)
-
-        else:
-            return missing_default
-
     # Parse the string like an environment variable value, which may contain
     # single quotes, double quotes or may be unquoted
     match = env_value_re.match(string)
-    groupdict = match.groupdict() if match is not None else None
-    if groupdict is None:
+    if match is None:
         return string
 
     # Try to parse the value based on the type of quoting
-    if "value" in groupdict and groupdict["value"]:
-        # Strip comments for non-quoted strings
-        value = groupdict["value"]
-        value = comment_re.sub(r"\1", value)  # Remove comments
+    if match["value"]:
+        return _sub_value(
+            match["value"],
+            quote="",
+            env_vars=env_vars,
+            missing_default=missing_default,
+            strip_values=strip_values,
+        )
+
+    elif match["qvalue"]:
+        return _sub_value(
+            match["qvalue"],
+            quote=match["quote"],
+            env_vars=env_vars,
+            missing_default=missing_default,
+            strip_values=strip_values,
+        )
+
+    else:
+        raise NotImplementedError
+
+
+def _sub_value(
+    value: str,
+    quote: str,
+    env_vars: t.Optional[t.Mapping[str, str]] = None,
+    missing_default: str = "",
+    strip_values: bool = True,
+) -> str:
+    """Substitute environment variables in a value that has already been
+    separated from its quotes.
+
+    See :func:`sub_env` for details on the parameters.
+    """
+
+    # Process the value based on the type of quoting
+    if not quote:
+        # Strip comments for non-quoted strings--i.e. from a '#' at the start or
+        # preceded by whitespace to the end of the line
+        i = value.find("#")
+        while i > 0 and not value[i - 1].isspace():
+            i = value.find("#", i + 1)
+        if i >= 0:
+            value = value[:i]
 
         # Substitute values for non-quoted values
-        value = sub_re.sub(sub_func, value)
+        if "$" in value:
+            value = sub_re.sub(_EnvSubber(env_vars, missing_default), value)
 
         # Strip whitespace, if specified
         return value.strip() if strip_values else value
 
-    elif "qvalue" in groupdict and groupdict["qvalue"]:
-        # Retrieve quoted value and quote type
-        value = groupdict["qvalue"]
-        quote = groupdict["quote"]
+    # Substitute escaped quotes
+    value = escaped_quote_re.sub(r"\1", value)
 
-        # Substitute escaped quotes
-        value = escaped_quote_re.sub(r"\1", value)
+    # Double-quote values may be substituted
+    if '"' in quote:  # double quoted
+        # process escape characters, e.g. \\t -> \t
+        value, _ = _unicode_escape(value)
 
-        # Double-quote values may be substituted
-        if '"' in quote:  # double quoted
-            # process escape characters, e.g. \\t -> \t
-            value = codecs.decode(value, "unicode_escape")
+        # substitute values for double quoted values
+        if "$" in value:
+            value = sub_re.sub(_EnvSubber(env_vars, missing_default), value)
+        return value
 
-            # substitute values for double quoted values
-            return sub_re.sub(sub_func, value)
+    # Single-quoted values are used literally--i.e. without substitution
+    return value
 
-        # Single-quoted values are used literally--i.e. without substitution
-        elif "'" in quote:
-            return value
 
-    else:
-        raise NotImplementedError
+def _find_quote(string: str, quote: str, start: int = 0) -> int:
+    """Find the index of the first quote in the string that isn't escaped
+    with a backslash, or -1 if it wasn't found."""
+    i = string.find(quote, start)
+    while i >= 0:
+        # An odd number of preceding backslashes escapes the quote
+        j = i
+        while j > 0 and string[j - 1] == "\\":
+            j -= 1
+        if (i - j) % 2 == 0:
+            return i
+        i = string.find(quote, i + 1)
+    return -1
 
 
 def parse_env(string: str, strip_values: bool = True) -> dict:
@@ -199,17 +261,58 @@ def parse_env(string: str, strip_values: bool = True) -> dict:
         are dict keys and the variable values are dict values.
     """
 
-    # Convert string into a dict
+    # Convert string into a dict by scanning it line-by-line
     env_vars = dict()
-    for match in env_name_value_re.finditer(string):
-        name = match.group(1)  # name (group 1)
+    # Only split on line endings (\n, \r\n and \r). str.splitlines also splits
+    # on other characters, like \x0c and \u2028, that may appear in values
+    lines = string.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    i = 0
+    while i < len(lines):
+        line = lines[i].lstrip()
+        i += 1
+
+        # Skip blank lines and comments
+        if not line or line.startswith("#"):
+            continue
 
-        # env_value match. Keep full group, including quotes so that sub_env can parse
-        # the value
-        rest = match.group(2)
+        # Split the name from the rest of the line, and skip invalid names
+        name, sep, rest = line.partition("=")
+        name = name.rstrip()
+        if not sep or not _is_valid_name(name):
+            continue
+
+        # Determine the quote type of the value, if the value is quoted
+        rest = rest.lstrip()
+        if rest[:1] in ("'", '"'):
+            quote = rest[:3] if rest.startswith(rest[0] * 3) else rest[0]
+        else:
+            quote = ""
+
+        if quote:
+            # Find the closing quote, which may be on a following line for
+            # multiline values. Text after the closing quote is ignored.
+            parts = [rest[len(quote) :]]
+            end = _find_quote(parts[0], quote)
+            j = i
+            while end < 0 and j < len(lines):
+                parts.append(lines[j])
+                end = _find_quote(lines[j], quote)
+                j += 1
+
+            # Skip values without a closing quote
+            if end < 0:
+                continue
+
+            parts[-1] = parts[-1][:end]
+            value = "\n".join(parts)
+            i = j
+        else:
+            value = rest
 
         # Substitute environment variables in the value
-        value = sub_env(rest, strip_values=strip_values, **env_vars)
+        value = _sub_value(
+            value, quote=quote, env_vars=env_vars, strip_values=strip_values
+        )
 
         # Add the new name-value pair in the env_vars
         env_vars[name] = value
@@ -241,25 +344,34 @@ def load_env(
     # Try loading the file
     filepath = Path(filepath)
     try:
-        string = filepath.read_text()
+        with open(filepath, "rb") as f:
+            data = f.read()
     except FileNotFoundError:
         logger.error(f"Could not file the file '{filepath}'")
         return 0
 
+    # Files without assignments (e.g. empty or only comments) have nothing to load
+    if b"=" not in data:
+        return dict()
+
+    # Decode in one shot, rather than through a text wrapper
+    string = data.decode("utf-8")
+
     # Parse the environment
     env_vars = parse_env(string=string, *args, **kwargs)
 
-    # Load the environment variables
-    updated_env_vars = dict()
-    for name, value in env_vars.items():
-        # Do nothing if the variable already exists, and overwrite isn't
-        # specified
-        if name in os.environ and not overwrite:
-            continue
+    # Load the environment variables. Variables that already exist are only
+    # replaced if overwrite is specified
+    if overwrite:
+        updated_env_vars = env_vars
+    else:
+        existing = set(os.environ)
+        updated_env_vars = {
+            name: value for name, value in env_vars.items() if name not in existing
+        }
 
+    for name, value in updated_env_vars.items():
         os.environ[name] = value
-        updated_env_vars[name] = value
-
-        logger.debug(f"Substituted environment variable {name}={value}")
+        logger.debug("Substituted environment variable %s=%s", name, value)
 
     return updated_env_vars
@@ -57,6 +57,37 @@ def test_cli_check(run, options):
     )
 
 
+@pytest.mark.parametrize("options", get_checks_files())
+def test_cli_check_sequential(options):
+    """Test CLI with checks run one at a time (cli.parallel = False) gives the
+    same results as checks run concurrently"""
+
+    def check_lines(result):
+        # The lines for individual check results--e.g. "Check path..."
+        return {line.strip() for line in result.output.splitlines() if "..." in line}
+
+    # Import the config here, rather than in the module namespace, since pytest's
+    # collection would otherwise add attributes to the config while probing it
+    from thatway import config
+
+    runner = CliRunner()
+    parallel_result = runner.invoke(geo_cli, [str(options)])
+
+    parallel = config.cli.parallel
+    try:
+        config.update({"cli": {"parallel": False}})
+        assert config.cli.parallel is False
+        sequential_result = runner.invoke(geo_cli, [str(options)])
+    finally:
+        config.update({"cli": {"parallel": parallel}})
+
+    # Failed checks exit with SystemExit. Other exceptions are errors
+    assert not isinstance(sequential_result.exception, Exception)
+    assert sequential_result.exit_code == parallel_result.exit_code
+    assert check_lines(sequential_result) == check_lines(parallel_result)
+    assert len(check_lines(sequential_result)) > 0
+
+
 @pytest.mark.parametrize("options", ("examples/geomancy.*",))
 def test_cli_check_glob(run, options):
     """Test the CLI with glob patterns"""
@@ -114,6 +145,34 @@ def test_cli_handle_env(run, flag, test_env_file):
             assert os.environ[name] == value
 
 
+def test_cli_handle_env_missing(run):
+    """Test the -e/--env option with an environment file that doesn't exist"""
+    result = run(("run", "-e", "missing__.env", "echo", "here!"), expected_code=2)
+    assert "Could not find the environment file 'missing__.env'" in result.output
+
+
+def test_cli_handle_env_glob(run, test_env_file):
+    """Test the -e/--env option with a glob pattern for environment files.
+
+    See ./conftest.py for details on the 'test_env_file' fixture.
+    """
+    variables = test_env_file["variables"]
+
+    # A glob pattern, relative to the project root, that matches 'test.env'
+    pattern = "tests/data/*.env"
+
+    with pytest.MonkeyPatch.context() as mp:
+        # Reset env variables
+        for name in variables.keys():
+            mp.delenv(name, raising=False)
+
+        result = run(("run", "-e", pattern, "echo", "here!"))
+
+        # The variables are loaded in the current process
+        for name, value in variables.items():
+            assert os.environ[name] == value
+
+
 def test_cli_run(run, test_env_file):
     """Test the 'run' subcommand and the handle_env function.
 
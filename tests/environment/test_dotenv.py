@@ -23,6 +23,13 @@ def test_sub_env():
         assert sub_env("$VAR2") == "variable2"
         assert sub_env("$MISSING") == ''
 
+        # Test with variables in addition to os.environ
+        assert sub_env("$OTHER", env_vars={"OTHER": "other"}) == "other"
+        assert sub_env("$VAR1", env_vars={"VAR1": "other"}) == "variable1"
+
+        # Test with a default for missing variables
+        assert sub_env("$MISSING", "fallback") == "fallback"
+
 
 def test_parse_env_docker_rules():
     """Test the parse_env function rules compared to docker dotenv rules.
@@ -44,9 +51,22 @@ def test_parse_env_docker_rules():
     assert p('VAR="VAL"') == {"VAR": "VAL"}
     assert p("VAR='VAL'") == {"VAR": "VAL"}
 
+    # Quoted values may be empty or contain the other quote type
+    assert p('VAR=""') == {"VAR": ""}
+    assert p("VAR=''") == {"VAR": ""}
+    assert p('VAR="it\'s"') == {"VAR": "it's"}
+
+    # Unquoted values may contain quotes and braces
+    assert p('VAR=x"y') == {"VAR": 'x"y'}
+    assert p('VAR={"k": 1}') == {"VAR": '{"k": 1}'}
+
+    # Quoted values end at the first unescaped closing quote
+    assert p('VAR="a"b"c"') == {"VAR": "a"}
+
     # Inline comments for unquoted values must be preceded with a space
     assert p("VAR=VAL # comment") == {"VAR": "VAL"}
     assert p("VAR=VAL# not a comment") == {"VAR": "VAL# not a comment"}
+    assert p("VAR=VAL #") == {"VAR": "VAL"}  # bare comment
 
     # Inline comments for quoted values must follow the closing quote
     assert p('VAR="VAL # not a comment"') == {"VAR": "VAL # not a comment"}
@@ -73,6 +93,33 @@ def test_parse_env_docker_rules():
     assert p(r"VAR=some\tvalue") == {"VAR": r"some\tvalue"}
 
 
+def test_parse_env_multiline():
+    """Test the parse_env function with values that span multiple lines"""
+    p = parse_env
+
+    # Quoted values may span multiple lines
+    assert p('VAR="first\nsecond"') == {"VAR": "first\nsecond"}
+    assert p('VAR="first\r\nsecond"') == {"VAR": "first\nsecond"}  # normalized
+    assert p('VAR="""first\nsecond""" # comment') == {"VAR": "first\nsecond"}
+    assert p("VAR='''first\nsecond'''") == {"VAR": "first\nsecond"}
+
+    # Variable names may match the names of function parameters
+    assert p("quote=VAL\nstring=$quote") == {"quote": "VAL", "string": "VAL"}
+
+    # Only line endings (\n, \r\n, \r) separate lines. Other line boundary
+    # characters are kept in values
+    assert p("VAR=x\x0cy\nOTHER=VAL") == {"VAR": "x\x0cy", "OTHER": "VAL"}
+    assert p('VAR="x\x0cy"\r\nOTHER=VAL') == {"VAR": "x\x0cy", "OTHER": "VAL"}
+    assert p("VAR='x\u2028y'\rOTHER=VAL") == {"VAR": "x\u2028y", "OTHER": "VAL"}
+    assert p("VAR=x\x85y\nOTHER=VAL") == {"VAR": "x\x85y", "OTHER": "VAL"}
+
+    # Empty values do not consume the following line
+    assert p("VAR=\nOTHER=VAL") == {"VAR": "", "OTHER": "VAL"}
+
+    # Values without a closing quote are skipped
+    assert p('VAR="unclosed\nOTHER=VAL') == {"OTHER": "VAL"}
+
+
 def test_parse_env_docker_parameter_expansion():
     """Test the parse_env_str function parameter expansion compared to docker
     dotenv parameter expansion.
@@ -152,3 +199,11 @@ def test_load_env(test_env_file):
         # be overwritten
         env_vars = load_env(filepath=filepath, overwrite=True)
         assert len(env_vars) == len(variables)
+
+
+def test_load_env_without_assignments(tmp_path):
+    """Test the load_env function with env files that have no variables"""
+    for contents in ("", "# Only a comment\n", "\n\n"):
+        filepath = tmp_path / ".env"
+        filepath.write_text(contents)
+        assert load_env(filepath=filepath) == {}